@@ -1,15 +1,255 @@
-import json
+import array, json
 from pathlib import Path
-import functools, inspect, time, warnings
-from typing import Any, Callable, Dict, Optional, Union
+import functools, logging, sys, time, warnings
+import contextlib
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    np = None  # type: ignore[assignment, unused-ignore]
+
+try:
+    from numba import njit  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    njit = None  # type: ignore[assignment, unused-ignore]
+
+_dumps: Callable[[Any], bytes]
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps = lambda data: json.dumps(data).encode()
+    _loads = json.loads
+
+
+def _sum_intervals_loop(
+    starts: 'np.ndarray',
+    stops: 'np.ndarray',
+    intervals: int
+) -> int:
+    
+    """
+    Sums the first 'intervals' stop - start differences, JIT-compiled at import 
+    when numba is available!
+    """
+
+    total = 0
+    for i in range(intervals):
+        total += stops[i] - starts[i]
+    return total
+
+
+_sum_intervals: Optional[Callable[[Any, Any, int], int]] = None
+if njit is not None:
+    try:
+        _sum_intervals = njit('i8(i8[:], i8[:], i8)', cache=True)(
+            _sum_intervals_loop
+        )
+    except TypeError:
+        # In a mypyc build the loop is already compiled, numba only JITs plain 
+        # Python functions!
+        _sum_intervals = None
+
+_perf = time.perf_counter_ns
+_log = logging.getLogger('chronokit')
+# Frames from these files are skipped when looking for the user's call site!
+_internal_files = (__file__, contextlib.__file__)
+
+
+def _to_ns_markers(
+    markers: list
+) -> array.array:
+    
+    """
+    Rebuilds a saved marker list as an int64 array! Files saved before markers 
+    were kept in nanoseconds store float seconds, those are converted.
+
+    Args:
+        - markers (list): Start or stop markers as read from the saved file!
+    
+    Returns:
+        - array.array: The markers in nanoseconds!
+    """
+
+    return array.array(
+        'q',
+        [
+            round(marker * 1e9) if isinstance(marker, float) else marker
+            for marker in markers
+        ]
+    )
+
+
+def _save_block_log(
+    tracker: 'TimeTracker',
+    message: str
+) -> None:
+    
+    """
+    Use this to block and save to log! Only reached on blocked calls, so the 
+    caller's frame is looked up here and never on the normal path.
+
+    Args:
+        - tracker (TimeTracker): The tracker that blocked the action!
+        - message (str): Blocked method and reason, built once per decorated method!
+    """
+
+    # Walk out of this module (and contextlib, for 'interval') instead of skipping 
+    # a fixed number of frames, compiled builds don't create frames for it!
+    caller = sys._getframe(0)
+    while (
+        caller.f_code.co_filename in _internal_files
+        and caller.f_back is not None
+    ):
+        caller = caller.f_back
+    local = caller.f_code.co_filename
+    line = caller.f_lineno
+
+    if tracker.warn_via_warnings:
+        warnings.warn_explicit(
+            message=message,
+            category=UserWarning,
+            filename=local,
+            lineno=line
+        )
+    else:
+        _log.warning('%s:%d %s', local, line, message)
+    tracker.track_log['blocked'].append(
+        (
+            local, 
+            line,
+            message
+        )
+    )
+
+
+def _guard_start(
+    function: Callable[['TimeTracker'], Any]
+) -> Callable[['TimeTracker'], Any]:
+    
+    """
+    This is a private decorator, use it only on 'start' to block double calls!
+    The wrapper takes only 'self', like the method it guards, so no argument 
+    tuple or dict is packed per call!
+    """
+
+    double_call = f'Blocked: {function.__qualname__}; Double call!'
+
+    @functools.wraps(function)
+    def wrapper(
+        self: 'TimeTracker'
+    ) -> Any:
+
+        if self._running:
+            return _save_block_log(
+                tracker=self,
+                message=double_call
+            )
+        self._running = 1
+        return function(self)
+
+    return wrapper
+
+
+def _guard_stop(
+    function: Callable[['TimeTracker'], Any]
+) -> Callable[['TimeTracker'], Any]:
+    
+    """
+    This is a private decorator, use it only on 'stop' to block double calls!
+    """
+
+    double_call = f'Blocked: {function.__qualname__}; Double call!'
+
+    @functools.wraps(function)
+    def wrapper(
+        self: 'TimeTracker'
+    ) -> Any:
+
+        if not self._running:
+            return _save_block_log(
+                tracker=self,
+                message=double_call
+            )
+        self._running = 0
+        return function(self)
+
+    return wrapper
+
+
+def _guard_get(
+    function: Callable[['TimeTracker'], Any]
+) -> Callable[['TimeTracker'], Any]:
+    
+    """
+    This is a private decorator, use it only on 'get_elapsed_time' to block 
+    calculations on empty or unfinished trackers!
+    """
+
+    not_started = (
+        f"Blocked: {function.__qualname__}; The tracker hasn't started yet!"
+    )
+    not_completed = (
+        f"Blocked: {function.__qualname__}; The tracker hasn't been completed yet!"
+    )
+
+    @functools.wraps(function)
+    def wrapper(
+        self: 'TimeTracker'
+    ) -> Any:
+
+        if not self.track_log['start']:
+            return _save_block_log(
+                tracker=self,
+                message=not_started
+            )
+        if not self.track_log['stop']:
+            return _save_block_log(
+                tracker=self,
+                message=not_completed
+            )
+        if self._running:
+            warnings.warn(
+                message='Opened tracker. Only closed trackers will be calculated.',
+                category=UserWarning
+            )
+        return function(self)
+
+    return wrapper
 
 
 class TimeTracker:
 
 
+    __slots__ = (
+        'name',
+        '_running',
+        'elapsed_time',
+        'total_elapsed_time',
+        'track_log',
+        'file_name',
+        '_starts',
+        '_stops',
+        'warn_via_warnings'
+    )
+
+    name: str
+    _running: int
+    elapsed_time: Optional[float]
+    total_elapsed_time: Optional[float]
+    track_log: Dict[str, Any]
+    file_name: str
+    _starts: array.array
+    _stops: array.array
+    warn_via_warnings: bool
+
     def __init__(
         self: 'TimeTracker',
-        name: str
+        name: str,
+        warn_via_warnings: bool = False
     ) -> None:
         
         """
@@ -18,6 +258,8 @@ class TimeTracker:
 
         Args:
             - name (str): Name or ID for this tracker! 
+            - warn_via_warnings (bool): Report blocked actions as UserWarning instead of
+              on the 'chronokit' logger!
 
         Attributes:
             - name (str): Name or ID for this tracker!
@@ -27,129 +269,52 @@ class TimeTracker:
             - total_elapsed_time (float): The time from the initial start to the final stop,
               without excluding any stops!
             - track_log (Dict): Used to store tracker data!
-                - start: Stores all start markers.
-                - stop: Stores all stop markers.
+                - start: Stores all start markers, in nanoseconds, as a contiguous int64 array.
+                - stop: Stores all stop markers, in nanoseconds, as a contiguous int64 array.
                 - blocked: Stores all blocked actions in the sequence of location, line, and reason.
             - file_name (str): Name of the file where the data will be saved!
+            - warn_via_warnings (bool): 'False' blocked actions are reported on the
+              'chronokit' logger, 'True' they are raised as UserWarning!
         """
 
         self.name = name
-        self.is_running = False
+        self._running = 0
         self.elapsed_time = None
         self.total_elapsed_time = None
-        self.track_log: Dict = {
-            'start': [],
-            'stop': [],
+        self.track_log = {
+            'start': array.array('q'),
+            'stop': array.array('q'),
             'blocked': []
         }
-        self.file_name: str = f'chronodata_{self.name}.json'
+        self._starts = self.track_log['start']
+        self._stops = self.track_log['stop']
+        self.file_name = f'chronodata_{self.name}.json'
+        self.warn_via_warnings = warn_via_warnings
 
-    def _bug_blocker(
-        function: Callable[['TimeTracker'], Any]
-    ) -> Callable[['TimeTracker'], Any]:
+    @property
+    def is_running(
+        self: 'TimeTracker'
+    ) -> bool:
         
         """
-        This is a private decorator, use it only to prevent and block possible problems 
-        in functions!
+        'False' the timer has stopped, 'True' it's running! Stored as an int so 
+        the guards only compare and store small ints!
         """
 
-        def _save_block_log(
-            self: 'TimeTracker',
-            line: int,
-            local: Union[Path, str],
-            reason: str
-        ) -> None:
-            
-            """
-            Use this to block and save to log!
-
-            Args:
-                - self: The class instance!
-                - line (int): Line where the action was blocked!
-                - local (Union[Path, str]): Local where the action was blocked!
-                - reason (str): Reason for blocking the action!
-            """
-
-            warnings.warn_explicit(
-                message=f'Blocked: {function.__qualname__}; {reason}',
-                category=UserWarning,
-                filename=local,
-                lineno=line
-            )
-            self.track_log['blocked'].append(
-                (
-                    local, 
-                    line,
-                    f'Blocked: {function.__qualname__}; {reason}'
-                )
-            )
+        return self._running == 1
 
-        @functools.wraps(function)
-        def wrapper(
-            self: 'TimeTracker',
-            *args,
-            **kwargs
-        ) -> Any:
-               
-            frame_info = inspect.getframeinfo(
-                inspect.currentframe().f_back
-            )
-            if function.__name__ == 'start':
-                if self.is_running:
-                    _save_block_log(
-                        self=self,
-                        line=frame_info[1],
-                        local=frame_info[0],
-                        reason='Double call!'    
-                    )
-                else:
-                    self.is_running = True
-                    return function(self, *args, **kwargs)
-
-            elif function.__name__ == 'stop':
-                if not self.is_running:
-                    _save_block_log(
-                        self=self,
-                        line=frame_info[1],
-                        local=frame_info[0],
-                        reason='Double call!'    
-                    )
-                else:
-                    self.is_running = False
-                    return function(self, *args, **kwargs)
-            
-            elif function.__name__ == 'get_elapsed_time':
-                if not self.track_log['start']:
-                    _save_block_log(
-                        self=self,
-                        line=frame_info[1],
-                        local=frame_info[0],
-                        reason="The tracker hasn't started yet!"    
-                    )
-                    return None
-                elif not self.track_log['stop']:
-                    _save_block_log(
-                        self=self,
-                        line=frame_info[1],
-                        local=frame_info[0],
-                        reason="The tracker hasn't been completed yet!"
-                    )
-                    return None
-                elif self.is_running:
-                    warnings.warn(
-                        message='Opened tracker. Only closed trackers will be calculated.',
-                        category=UserWarning
-                    )
-                    return function(self, *args, **kwargs)
-                else:
-                    return function(self, *args, **kwargs)
-                
-        return wrapper
+    @is_running.setter
+    def is_running(
+        self: 'TimeTracker',
+        value: bool
+    ) -> None:
+        
+        self._running = 1 if value else 0
 
-    @_bug_blocker
+    @_guard_start
     def start(
         self: 'TimeTracker'
-    ) -> float:
+    ) -> int:
         
         """
         Start the timer!
@@ -158,18 +323,18 @@ class TimeTracker:
             - self: The class instance!
         
         Returns:
-            - float: Time when the chronometer started!
+            - int: Time, in nanoseconds, when the chronometer started!
         """
 
-        start_time = time.perf_counter()
-        self.track_log['start'].append(start_time)
+        start_time = _perf()
+        self._starts.append(start_time)
         
         return start_time
     
-    @_bug_blocker
+    @_guard_stop
     def stop(
         self: 'TimeTracker'
-    ) -> float:
+    ) -> int:
         
         """
         Stop or pause the timer!
@@ -178,15 +343,60 @@ class TimeTracker:
             - self: The class instance!
         
         Returns:
-            - float: Time when the chronometer stoped!
+            - int: Time, in nanoseconds, when the chronometer stoped!
         """
 
-        stop_time = time.perf_counter()
-        self.track_log['stop'].append(stop_time)
+        stop_time = _perf()
+        self._stops.append(stop_time)
 
         return stop_time           
 
-    @_bug_blocker
+    @contextlib.contextmanager
+    def interval(
+        self: 'TimeTracker'
+    ) -> Iterator['TimeTracker']:
+        
+        """
+        Times the body of a 'with' block as one start/stop interval! This is the 
+        preferred way to measure, both markers are taken without going through the 
+        start and stop guards. Entering it on a running tracker is blocked, and so 
+        is closing it after the tracker was stopped inside the block!
+
+        Args:
+            - self: The class instance!
+        
+        Yields:
+            - TimeTracker: The class instance!
+        """
+
+        if self._running:
+            _save_block_log(
+                tracker=self,
+                message='Blocked: TimeTracker.interval; Double call!'
+            )
+            yield self
+            return
+
+        self._running = 1
+        stops = len(self._stops)
+        self._starts.append(_perf())
+        try:
+            yield self
+        finally:
+            stop_time = _perf()
+            if self._running and len(self._stops) == stops:
+                self._stops.append(stop_time)
+                self._running = 0
+            else:
+                _save_block_log(
+                    tracker=self,
+                    message=(
+                        'Blocked: TimeTracker.interval; '
+                        'The tracker was stopped inside the interval!'
+                    )
+                )
+
+    @_guard_get
     def get_elapsed_time(
         self: 'TimeTracker'
     ) -> Union[float, None]:
@@ -205,20 +415,29 @@ class TimeTracker:
         self.total_elapsed_time = (
             self.track_log['stop'][-1] - 
             self.track_log['start'][0]
-        ) 
-        if self.elapsed_time is None:
-            _elapsed_time = 0
-            
+        ) * 1e-9
         start_log = self.track_log['start']
         stop_log = self.track_log['stop']
-        
-        if self.is_running:
-            start_log.pop()
 
-        for start, stop in zip(start_log, stop_log):        
-            _elapsed_time += stop - start
+        # An open tracker has one start more than stops, so only the
+        # closed intervals are summed!
+        intervals = min(len(start_log), len(stop_log))
+        if _sum_intervals is not None:
+            _elapsed_time = _sum_intervals(
+                np.frombuffer(start_log, dtype=np.int64),
+                np.frombuffer(stop_log, dtype=np.int64),
+                intervals
+            )
+        elif np is not None:
+            starts = np.frombuffer(start_log, dtype=np.int64)[:intervals]
+            stops = np.frombuffer(stop_log, dtype=np.int64)[:intervals]
+            _elapsed_time = int((stops - starts).sum())
+        else:
+            _elapsed_time = sum(
+                stop - start for start, stop in zip(start_log, stop_log)
+            )
         
-        self.elapsed_time = _elapsed_time
+        self.elapsed_time = _elapsed_time * 1e-9
         return self.elapsed_time
     
     def save(
@@ -231,14 +450,18 @@ class TimeTracker:
             'is_running': self.is_running,
             'elapsed_time': self.elapsed_time,
             'total_elapsed_time': self.total_elapsed_time,
-            'log': self.track_log
+            'log': {
+                'start': list(self.track_log['start']),
+                'stop': list(self.track_log['stop']),
+                'blocked': self.track_log['blocked']
+            }
         }
         
         if dir_path is None: dir_path = self.file_name
         else: dir_path = Path(dir_path) / self.file_name
         
-        with open(dir_path, 'w+') as file:
-            json.dump(data, file)
+        with open(dir_path, 'wb') as file:
+            file.write(_dumps(data))
 
     def load(
         self: 'TimeTracker',
@@ -248,23 +471,39 @@ class TimeTracker:
         if dir_path is None: dir_path = self.file_name
         else: dir_path = Path(dir_path) / self.file_name
 
-        with open(dir_path, 'r') as file:
-            data = json.load(file)
+        with open(dir_path, 'rb') as file:
+            data = _loads(file.read())
         
         self.name = data['name']
         self.is_running = data['is_running']
         self.elapsed_time = data['elapsed_time']
         self.total_elapsed_time = data['total_elapsed_time']
-        self.track_log = data['log']
+        self.track_log = {
+            'start': _to_ns_markers(data['log']['start']),
+            'stop': _to_ns_markers(data['log']['stop']),
+            'blocked': data['log']['blocked']
+        }
+        self._starts = self.track_log['start']
+        self._stops = self.track_log['stop']
         
 
 
+# Not usable from a mypyc build: mypyc puts the vectorcall slot for '__call__' ahead 
+# of the inherited TimeTracker fields, so calling an instance crashes. Only 
+# TimeTracker is supported there!
 class ExecutionTimeTracker(TimeTracker):
 
 
+    __slots__ = (
+        'function',
+    )
+
+    function: Callable[..., Any]
+
     def __init__(
         self: 'ExecutionTimeTracker',
-        function: Callable[[Any], Any]
+        function: Callable[[Any], Any],
+        warn_via_warnings: bool = False
     ) -> None:
         
         """
@@ -273,6 +512,8 @@ class ExecutionTimeTracker(TimeTracker):
 
         Args:
             - function (callable): The function to be timed.
+            - warn_via_warnings (bool): Report blocked actions as UserWarning instead of
+              on the 'chronokit' logger!
             
         Attributes:
             - function (callable): The function to be timed.
@@ -283,7 +524,8 @@ class ExecutionTimeTracker(TimeTracker):
         
         self.function = function
         super().__init__(
-            name=function.__qualname__
+            name=function.__qualname__,
+            warn_via_warnings=warn_via_warnings
         )
 
     def __call__(
@@ -292,18 +534,24 @@ class ExecutionTimeTracker(TimeTracker):
         **kwargs: Any
     ) -> Any:
         
-        self.start()
-        self.func_out = self.function(
+        # The call pattern is always start -> function -> stop, so the guards
+        # are skipped and both markers are taken inline!
+        start_time = _perf()
+        func_out = self.function(
             *args, **kwargs
         )
-        self.stop()    
+        stop_time = _perf()
+        self._starts.append(start_time)
+        self._stops.append(stop_time)
     
-        return self.func_out
+        return func_out
+
 
-b = TimeTracker('aasdsd')
-b.start()
+if __name__ == '__main__':
+    b = TimeTracker('aasdsd')
+    b.start()
 
-time.sleep(1)
+    time.sleep(1)
 
-b.stop()
-print(b.get_elapsed_time())
+    b.stop()
+    print(b.get_elapsed_time())